@@ -9,6 +9,8 @@ Categories:
 - Other: greetings, expressions, particles, etc.
 """
 import re
+from functools import lru_cache
+from pathlib import Path
 
 # Define word patterns for categorization
 VERBS = {
@@ -104,55 +106,109 @@ OTHER = {
     'and', 'or', 'but', 'because', 'if', 'although', 'though', 'however', 'therefore'
 }
 
+# Categories in order of precedence: when several match, the lowest index wins
+CATEGORIES = [
+    ('Verb', VERBS),
+    ('Adjective', ADJECTIVES),
+    ('Adverb', ADVERBS),
+    ('Other', OTHER),
+]
+
+# Trie nodes are dicts keyed by word token; the END key marks a complete
+# category word and holds the priority of its category
+END = None
+
+def build_trie(priorities, reverse=False):
+    """Build a token trie over (priority, words) pairs, optionally keyed from the last token."""
+    trie = {}
+    for priority, words in priorities:
+        for word in words:
+            tokens = word.split(' ')
+            if reverse:
+                tokens.reverse()
+            node = trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            # Words listed in several categories keep the highest-precedence one
+            node[END] = min(priority, node.get(END, priority))
+    return trie
+
+PREFIX_TRIE = build_trie(
+    (priority, words) for priority, (_, words) in enumerate(CATEGORIES) if priority
+)
+SUFFIX_TRIE = build_trie(
+    ((priority, words) for priority, (_, words) in enumerate(CATEGORIES) if priority),
+    reverse=True,
+)
+
+# Single-word category words mapped to their highest-precedence category
+# (verbs are all "to ..." phrases); reversed so earlier categories win
+WORD_TO_POS = {
+    word: category
+    for category, words in reversed(CATEGORIES[1:])
+    for word in words
+    if ' ' not in word
+}
+
+def walk_trie(trie, tokens, best: int) -> int:
+    """Return the best priority among the category words the tokens start with."""
+    node = trie
+    for token in tokens:
+        node = node.get(token)
+        if node is None:
+            break
+        best = min(best, node.get(END, best))
+    return best
+
+# Pure function of the meaning, and many entries share glosses
+@lru_cache(maxsize=None)
 def categorize_word(english_meaning: str) -> str:
     """Determine the part of speech based on English meaning."""
     en_lower = english_meaning.lower().strip()
     
-    # Check for verb patterns (starts with "to ")
+    # Check for verb patterns (starts with "to "); every entry in VERBS does
     if en_lower.startswith('to '):
         return 'Verb'
     
-    # Check for exact matches in categories
-    for verb in VERBS:
-        if verb in en_lower:
-            return 'Verb'
-    
-    for adj in ADJECTIVES:
-        if en_lower == adj or en_lower.startswith(adj + ' ') or en_lower.endswith(' ' + adj):
-            return 'Adjective'
+    # A single word can only match a category word exactly: one dict lookup
+    if ' ' not in en_lower:
+        return WORD_TO_POS.get(en_lower, 'Noun')
     
-    for adv in ADVERBS:
-        if en_lower == adv or en_lower.startswith(adv + ' ') or en_lower.endswith(' ' + adv):
-            return 'Adverb'
+    tokens = en_lower.split(' ')
     
-    for other in OTHER:
-        if en_lower == other or en_lower.startswith(other + ' ') or en_lower.endswith(' ' + other):
-            return 'Other'
+    # Other words must be the whole meaning, its first word or its last word
+    best = len(CATEGORIES)
+    best = walk_trie(PREFIX_TRIE, tokens, best)
+    best = walk_trie(SUFFIX_TRIE, reversed(tokens), best)
+    if best < len(CATEGORIES):
+        return CATEGORIES[best][0]
     
     # Default to Noun for most words (objects, people, places, etc.)
     return 'Noun'
 
+# Pattern to match word objects: { id: '...', ..., morae: N }
+# We need to insert pos: 'Category' before the closing }
+OBJECT_PATTERN = re.compile(
+    r"(\{ id: '[^']+', kana: '[^']+', romaji: '[^']+', kanji: '[^']+', en: '([^']+)', morae: \d+ \})",
+    re.ASCII,
+)
+
 def process_words_file(filepath: str):
     """Add pos field to all word entries in words.ts."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = Path(filepath).read_text(encoding='utf-8')
     
-    # Pattern to match word objects: { id: '...', ..., morae: N }
-    # We need to insert pos: 'Category' before the closing }
-    pattern = r"(\{ id: '[^']+', kana: '[^']+', romaji: '[^']+', kanji: '[^']+', en: '([^']+)', morae: \d+ \})"
-    
-    def add_pos(match):
-        full_obj = match.group(1)
-        en_value = match.group(2)
-        pos = categorize_word(en_value)
+    # Copy the text between matches as-is and rebuild each matched object
+    out = []
+    pos = 0
+    for match in OBJECT_PATTERN.finditer(content):
+        out.append(content[pos:match.start()])
         # Replace the closing } with , pos: 'Category' }
-        new_obj = full_obj[:-2] + f", pos: '{pos}' }}"
-        return new_obj
-    
-    new_content = re.sub(pattern, add_pos, content)
+        out.append(match.group(1)[:-2])
+        out.append(f", pos: '{categorize_word(match.group(2))}' }}")
+        pos = match.end()
+    out.append(content[pos:])
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    Path(filepath).write_text(''.join(out), encoding='utf-8')
     
     print(f"Successfully added pos field to words in {filepath}")
 
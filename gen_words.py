@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Regenerate words.ts and words_generated.py in one pass.
+
+Does the work of remove_duplicates.py, add_pos.py and reorder_words_v2.py
+together on a single parse of words.ts:
+- keeps only the first entry for each romaji
+- fills in pos for entries that do not have one yet
+- recalculates morae and sorts by morae
+
+The final list is also written to words_generated.py as a Python literal, so
+scripts can `from words_generated import WORDS` instead of parsing words.ts.
+Re-run after editing words.ts.
+"""
+from pathlib import Path
+
+from add_pos import categorize_word
+from reorder_words_v2 import WORD_PATTERN, parse_words, read_lines, render_words, sort_words
+
+WORDS_TS = './words.ts'
+WORDS_PY = './words_generated.py'
+
+PY_HEADER = '''"""Generated by gen_words.py from words.ts. Do not edit."""
+
+# (id, kana, romaji, kanji, en, morae, pos), sorted by morae
+WORDS = (
+'''
+
+def render_python(items) -> str:
+    """Render the entries as a tuple-of-tuples Python module."""
+    rows = [
+        '    %r,\n' % ((item['id'], item['kana'], item['romaji'], item['kanji'],
+                        item['en'], item['morae'], item['pos']),)
+        for item in (entry['data'] for entry in items)
+    ]
+    return PY_HEADER + ''.join(rows) + ')\n'
+
+def generate(words_ts: str = WORDS_TS, words_py: str = WORDS_PY):
+    """Dedupe, categorize and reorder words.ts, then write both outputs."""
+    lines = read_lines(words_ts)
+    header_buffer, items, footer_buffer = parse_words(lines)
+
+    # parse_words reads one entry per line and raises on a line it cannot
+    # read; also refuse to overwrite words.ts if a line holds a second entry,
+    # which would otherwise be dropped
+    array_lines = lines[len(header_buffer):len(lines) - len(footer_buffer)]
+    crowded = [line.strip() for line in array_lines if len(WORD_PATTERN.findall(line)) > 1]
+    if crowded:
+        raise ValueError(
+            "More than one entry on a line in %s, words.ts left unchanged:\n  %s"
+            % (words_ts, '\n  '.join(crowded))
+        )
+
+    # Keep only the first occurrence of each romaji
+    seen_romaji = set()
+    unique = []
+    for entry in items:
+        romaji = entry['data']['romaji']
+        if romaji not in seen_romaji:
+            seen_romaji.add(romaji)
+            unique.append(entry)
+
+    # Categorize new words; existing pos values may have been set by hand
+    for entry in unique:
+        item = entry['data']
+        if 'pos' not in item:
+            item['pos'] = categorize_word(item['en'])
+
+    ordered = sort_words(unique)
+
+    Path(words_ts).write_text(render_words(header_buffer, ordered, footer_buffer), encoding='utf-8')
+    Path(words_py).write_text(render_python(ordered), encoding='utf-8')
+
+    print(f"Removed {len(items) - len(unique)} duplicate entries")
+    print(f"Wrote {len(ordered)} words to {words_ts} and {words_py}")
+
+if __name__ == '__main__':
+    try:
+        generate()
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
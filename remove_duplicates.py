@@ -1,42 +1,57 @@
 #!/usr/bin/env python3
 """Remove duplicate words by romaji from words.ts, keeping only the first occurrence."""
 
+import mmap
+import os
 import re
-
-# Read the file
-with open('/Users/userm/Documents/Vibe Coding/kanapop/words.ts', 'r', encoding='utf-8') as f:
-    content = f.read()
+from collections import Counter
 
 # Find all word entries
-word_pattern = re.compile(r"(\s*\{ id: '[^']+', kana: '[^']+', romaji: '([^']+)', kanji: '[^']+', en: '[^']+', morae: \d+ \},?)")
+# Works on the raw UTF-8 bytes: every delimiter is ASCII and no byte of a
+# multibyte kana/kanji character can be mistaken for one.
+# Unlike the str patterns this replaced, bytes \s only matches ASCII
+# whitespace: U+3000 (ideographic space), NBSP and U+0085 are not skipped before
+# an entry and do not count as blank in the blank-line clean-up below.
+word_pattern = re.compile(rb"(\s*\{ id: '[^']+', kana: '[^']+', romaji: '([^']+)', kanji: '[^']+', en: '[^']+', morae: \d+ \},?)")
 
 seen_romaji = set()
-duplicates = []
-
-def replace_duplicate(match):
-    full_match = match.group(0)
-    romaji = match.group(2)
-    
-    if romaji in seen_romaji:
-        duplicates.append(romaji)
-        # Return empty string with proper newline handling
-        return ''
-    else:
-        seen_romaji.add(romaji)
-        return full_match
-
-# Replace duplicates
-new_content = word_pattern.sub(replace_duplicate, content)
-
-# Clean up empty lines
-new_content = re.sub(r'\n\s*\n\s*\n', '\n\n', new_content)
-
-# Write back
-with open('/Users/userm/Documents/Vibe Coding/kanapop/words.ts', 'w', encoding='utf-8') as f:
-    f.write(new_content)
-
-print(f"Removed {len(duplicates)} duplicate entries:")
-for r in sorted(set(duplicates)):
-    count = duplicates.count(r)
-    print(f"  {r}: {count} duplicate(s)")
+dup_counts = Counter()
+
+def kept_pieces(content):
+    """Yield the text between entries and the first entry for each romaji."""
+    pos = 0
+    for match in word_pattern.finditer(content):
+        yield content[pos:match.start()]
+        romaji = match.group(2)
+
+        if romaji in seen_romaji:
+            dup_counts[romaji] += 1
+        else:
+            seen_romaji.add(romaji)
+            yield match.group(0)
+        pos = match.end()
+    yield content[pos:]
+
+# Three or more newlines (with any whitespace between) become one blank line
+blank_lines_pattern = re.compile(rb'\n\s*\n\s*\n')
+
+with open('/Users/userm/Documents/Vibe Coding/kanapop/words.ts', 'r+b') as f:
+    # An empty file cannot be mapped, and has nothing to remove
+    if os.fstat(f.fileno()).st_size:
+        # Scan the mapped file directly, without decoding it to text
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            # Text mode used to turn CRLF and CR into LF; do the same so the
+            # b'\n\n' clean-up cannot leave mixed line endings (costs a copy)
+            if content.find(b'\r') != -1:
+                content = content[:].replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+            out = blank_lines_pattern.sub(b'\n\n', b''.join(kept_pieces(content)))
+
+        # Write back
+        f.seek(0)
+        f.write(out)
+        f.truncate()
+
+print(f"Removed {sum(dup_counts.values())} duplicate entries:")
+for r, count in sorted(dup_counts.items()):
+    print(f"  {r.decode()}: {count} duplicate(s)")
 print(f"\nTotal unique romaji values kept: {len(seen_romaji)}")
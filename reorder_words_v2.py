@@ -1,59 +1,77 @@
+import io
 import re
 import traceback
+from pathlib import Path
 
-# Small kana that combine with preceding character to form 1 mora
-SMALL_KANA = set(['ゃ', 'ゅ', 'ょ', 'ぁ', 'ぃ', 'ぅ', 'ぇ', 'ぉ', 
-                  'ャ', 'ュ', 'ョ', 'ァ', 'ィ', 'ゥ', 'ェ', 'ォ'])
+# Small kana that combine with preceding character to form 1 mora,
+# as code points since that is what str.translate looks up
+SMALL_KANA_CODES = frozenset(map(ord, 'ゃゅょぁぃぅぇぉャュョァィゥェォ'))
+
+# Deletes small kana, leaving one character per mora
+SMALL_KANA_TABLE = dict.fromkeys(SMALL_KANA_CODES)
 
 def count_morae(kana):
-    count = 0
     # Special handling: 'tsu' small (っ) is a full mora.
-    # 'ya', 'yu', 'yo' small are not.
-    # We iterate and if we see a small kana (that isn't tsu), we assume it merged with previous.
-    # Actually, simpler:
-    # 1. Count ALL chars.
-    # 2. Subtract 1 for every small kana (except tsu).
-    
-    length = len(kana)
-    subtract = 0
-    for char in kana:
-        if char in SMALL_KANA:
-            subtract += 1
-    return length - subtract
+    # 'ya', 'yu', 'yo' small are not, they merge with the previous character.
+    # So the morae are the characters left after deleting small kana (except tsu).
+    return len(kana.translate(SMALL_KANA_TABLE))
+
+def quoted(name):
+    # 'value' or "value", captured as group <name> or <name>_dq; the value cannot
+    # contain its own quote, so it never runs on into the next field
+    return rf"""(?:'(?P<{name}>[^']*)'|"(?P<{name}_dq>[^"]*)")"""
+
+def field(name, value):
+    return rf"\s*,\s*{name}:\s*{value}"
+
+# One word object: { id: '...', kana: '...', romaji: '...', kanji: '...', en: '...', morae: N, pos: '...' }
+# en, morae and pos may be missing, pos may come before or after morae, and
+# spacing and quotes may vary
+WORD_PATTERN = re.compile(
+    r"\{\s*id:\s*" + quoted('id')
+    + field('kana', quoted('kana'))
+    + field('romaji', quoted('romaji'))
+    + field('kanji', quoted('kanji'))
+    + "(?:" + field('en', quoted('en')) + ")?"
+    + "(?:" + field('pos', quoted('pos')) + ")?"
+    + "(?:" + field('morae', r"(?P<morae>\d+)") + ")?"
+    + "(?:" + field('pos', quoted('pos_after')) + ")?"
+    + r"\s*,?\s*\}"
+)
+FIELD_NAMES = ('id', 'kana', 'romaji', 'kanji', 'en', 'morae', 'pos')
 
 def parse_line(line):
-    # Looking for { ... }
-    match = re.search(r'({.*?})', line)
+    match = WORD_PATTERN.search(line)
     if not match:
         return None, None
     
-    obj_str = match.group(1)
-    
     # Extract comment if any
     # content after the object, check for //
-    rest = line[match.end():]
     comment = ""
-    comment_match = re.search(r'//.*', rest)
-    if comment_match:
-        comment = comment_match.group(0).strip()
+    comment_start = line.find('//', match.end())
+    if comment_start != -1:
+        comment = line[comment_start:].strip()
     
-    # Parse object
-    item = {}
-    fields = re.finditer(r'(\w+):\s*([\'"])(.*?)\2|(\w+):\s*(\d+)', obj_str)
-    for f in fields:
-        if f.group(1):
-            item[f.group(1)] = f.group(3)
-        elif f.group(4):
-            item[f.group(4)] = int(f.group(5))
+    # Parse object, leaving out the optional fields that are missing
+    fields = match.groupdict()
+    for name in ('id', 'kana', 'romaji', 'kanji', 'en', 'pos', 'pos_after'):
+        if fields[name] is None:
+            fields[name] = fields[name + '_dq']
+    if fields['pos'] is None:
+        fields['pos'] = fields['pos_after']
+    item = {name: fields[name] for name in FIELD_NAMES if fields[name] is not None}
+    if 'morae' in item:
+        item['morae'] = int(item['morae'])
             
     return item, comment
 
-def process_file(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+# Reconstructed word line: string fields are always written single-quoted, and
+# render_words appends pos (when present) and the closing " },"
+# { id: 'neko', kana: 'ねこ', romaji: 'neko', kanji: '猫', en: 'Cat', morae: 2, pos: 'Noun' },
+LINE_FORMAT = "    { id: '%s', kana: '%s', romaji: '%s', kanji: '%s', en: '%s', morae: %d"
 
-    new_lines = []
-    
+def parse_words(lines):
+    # Split words.ts into header lines, word entries and footer lines
     # Header lines until export const WORDS
     in_array = False
     items = []
@@ -80,67 +98,82 @@ def process_file(file_path):
             if line.strip() == "":
                 continue
 
-            # Parse object line
-            try:
-                item, comment = parse_line(line)
-                if item:
-                    # Fix missing 'en'
-                    if 'en' not in item and item.get('id') == 'ukeru3':
-                         item['en'] = 'To receive'
-                    
-                    # Recalculate morae
-                    if 'kana' in item:
-                        item['morae'] = count_morae(item['kana'])
-                    
-                    items.append({'data': item, 'comment': comment})
-            except Exception as e:
-                print(f"Error processing line: {line.strip()}")
-                raise e
+            # Parse object line; lines without an object are skipped, but an
+            # object we cannot read must not silently vanish from words.ts
+            item, comment = parse_line(line)
+            if item is None and '{' in line:
+                raise ValueError(f"Could not parse word line: {line.strip()}")
+            if item:
+                # Fix missing 'en'
+                if 'en' not in item and item.get('id') == 'ukeru3':
+                    item['en'] = 'To receive'
+                
+                items.append({'data': item, 'comment': comment})
         else:
             if len(items) == 0:
                 header_buffer.append(line)
             else:
                 footer_buffer.append(line)
 
-    # Sort items by morae
-    # We want to keep original relative order for stability
-    # Python sort is stable
-    items.sort(key=lambda x: x['data']['morae'])
-    
+    return header_buffer, items, footer_buffer
+
+def sort_words(items):
+    # Recalculate morae
+    for entry in items:
+        item = entry['data']
+        if 'kana' in item:
+            item['morae'] = count_morae(item['kana'])
+
+    # Sort items by morae, comparing plain (morae, index) tuples
+    # The index keeps the original relative order among equal morae
+    # and means the entry dicts themselves are never compared
+    items = [(entry['data']['morae'], i, entry) for i, entry in enumerate(items)]
+    items.sort()
+    return [entry for _, _, entry in items]
+
+def render_words(header_buffer, items, footer_buffer):
     # Reconstruct
-    output = []
-    output.extend(header_buffer)
+    output = io.StringIO()
+    output.writelines(header_buffer)
     
     current_morae = -1
     
     for entry in items:
-        m = entry['data']['morae']
+        item = entry['data']
+        m = item['morae']
         if m != current_morae:
             current_morae = m
-            output.append(f"    // {m} Morae\n")
+            output.write(f"    // {m} Morae\n")
         
-        item = entry['data']
-        # Reconstruct line
-        # { id: 'neko', kana: 'ねこ', romaji: 'neko', kanji: '猫', en: 'Cat', morae: 2 },
-        # We need to preserve quotes? Single quotes usually.
-        
-        line_str = f"    {{ id: '{item['id']}', kana: '{item['kana']}', romaji: '{item['romaji']}', kanji: '{item['kanji']}', en: '{item['en']}', morae: {item['morae']} }},"
+        output.write(LINE_FORMAT % (item['id'], item['kana'], item['romaji'], item['kanji'], item['en'], item['morae']))
+        if 'pos' in item:
+            output.write(", pos: '%s'" % item['pos'])
+        output.write(" },")
         
         if entry['comment']:
-            line_str += f" {entry['comment']}"
+            output.write(" " + entry['comment'])
         
-        output.append(line_str + "\n")
+        output.write("\n")
 
-    output.extend(footer_buffer)
+    output.writelines(footer_buffer)
     
-    return "".join(output)
+    return output.getvalue()
+
+def read_lines(file_path):
+    # Same lines as f.readlines(): split on '\n' only, unlike str.splitlines,
+    # which would also break a line at characters such as '\x0c' or '\u2028'
+    return io.StringIO(Path(file_path).read_text(encoding='utf-8')).readlines()
+
+def process_file(file_path):
+    lines = read_lines(file_path)
+    header_buffer, items, footer_buffer = parse_words(lines)
+    return render_words(header_buffer, sort_words(items), footer_buffer)
 
 if __name__ == "__main__":
     file_path = "/Users/userm/Documents/Vibe Coding/kanapop/words.ts"
     try:
         new_content = process_file(file_path)
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(new_content)
+        Path(file_path).write_text(new_content, encoding="utf-8")
         print("Successfully reordered words.ts with comments preserved")
     except Exception as e:
         print(f"Error: {e}")